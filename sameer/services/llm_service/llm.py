@@ -1,6 +1,9 @@
-import requests
+import asyncio
+import httpx
 import json
 
+from collections import OrderedDict
+
 from Sameer.services.llm_service import vectordb
 from Sameer.services.ml_service import DataPreperation
 from Sameer.config import settings
@@ -9,16 +12,50 @@ from qdrant_client.conversions import common_types as types
 
 from fastapi import HTTPException, status
 
+OMDP_CACHE_SIZE = 10_000
+_omdp_cache: OrderedDict[str, dict] = OrderedDict()
+
+
+async def _fetch_omdp_data(
+    http_client: httpx.AsyncClient, imdb_id: str, omdp_api_key: str
+) -> dict:
+    """
+    Fetches the OMDb record for an imdb_id, serving repeated ids from an in-process LRU cache.
+    Only successful responses are cached so missing movies are retried on the next request.
+    """
+    if imdb_id in _omdp_cache:
+        _omdp_cache.move_to_end(imdb_id)
+        return _omdp_cache[imdb_id]
+
+    url = f"http://www.omdbapi.com/?apikey={omdp_api_key}&i={imdb_id}&plot=full"
+    response = await http_client.get(url)
+    data = response.json()
+    if data["Response"] != "False":
+        _omdp_cache[imdb_id] = data
+        if len(_omdp_cache) > OMDP_CACHE_SIZE:
+            _omdp_cache.popitem(last=False)
+    return data
+
 
 # TODO: add a way to only return priortize good rated movies
 class MoviesLLM:
     def __init__(self) -> None:
         self.client = vectordb.get_qdrant_client()
+        self.http_client = httpx.AsyncClient(timeout=10)
 
-    def __get_omdp_data(self, imdb_id: str, omdp_api_key: str = settings.OMDP_API_KEY):
-        url = f"http://www.omdbapi.com/?apikey={omdp_api_key}&i={imdb_id}&plot=full"
-        response = requests.get(url)
-        data = response.json()
+    async def aclose(self) -> None:
+        await self.http_client.aclose()
+
+    async def __aenter__(self) -> "MoviesLLM":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def __get_omdp_data(
+        self, imdb_id: str, omdp_api_key: str = settings.OMDP_API_KEY
+    ):
+        data = await _fetch_omdp_data(self.http_client, imdb_id, omdp_api_key)
         if data["Response"] == "False":
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -37,11 +74,17 @@ class MoviesLLM:
         imdb_id = DataPreperation.get_id_to_imdb_mapping(movie_id)
         return imdb_id if imdb_id else None
 
-    def get_movies(self, query: str, limit: int = 5):
+    def _get_imdb_ids(self, query: str, limit: int = 5) -> list[str]:
         vdb_results = self._search(query=query, limit=limit)
         imdb_ids = [self._get_imdb_id(vector.id) for vector in vdb_results]
-        response = {
-            idx: self.__get_omdp_data(imdb_id=imdb_id)
-            for idx, imdb_id in enumerate(imdb_ids)
-        }
+        return [imdb_id for imdb_id in imdb_ids if imdb_id is not None]
+
+    async def get_movies(self, query: str, limit: int = 5):
+        # The embedding request, the Qdrant search and the first read of the
+        # id mapping CSV are all blocking, so keep them off the event loop.
+        imdb_ids = await asyncio.to_thread(self._get_imdb_ids, query, limit)
+        movies = await asyncio.gather(
+            *(self.__get_omdp_data(imdb_id=imdb_id) for imdb_id in imdb_ids)
+        )
+        response = dict(enumerate(movies))
         return response
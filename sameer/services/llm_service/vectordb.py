@@ -1,3 +1,6 @@
+import functools
+
+import numpy as np
 import pandas as pd
 
 from Sameer.config import settings
@@ -8,15 +11,12 @@ from qdrant_client.conversions import common_types as types
 from llama_index.embeddings.openai import OpenAIEmbedding
 
 
-def get_qdrant_client() -> QdrantClient | None:
-    client = None
-    try:
-        client = QdrantClient(
-            url=settings.QDRANT_URL,
-            api_key=settings.QDRANT_API_KEY,
-        )
-    except Exception as e:
-        print(f"Error while connecting to qdrant: {e}")
+@functools.lru_cache(maxsize=None)
+def get_qdrant_client() -> QdrantClient:
+    client = QdrantClient(
+        url=settings.QDRANT_URL,
+        api_key=settings.QDRANT_API_KEY,
+    )
     return client
 
 
@@ -31,6 +31,7 @@ def get_qdrant_collections() -> types.CollectionsResponse:
     return collections
 
 
+@functools.lru_cache(maxsize=None)
 def get_openai_embeddings(
     embedding_model: str = "text-embedding-3-small",
 ) -> OpenAIEmbedding:
@@ -40,39 +41,67 @@ def get_openai_embeddings(
     return embed_model
 
 
+@functools.lru_cache(maxsize=10_000)
 def get_text_embeddings(query: str) -> list[float]:
     embedding_model = get_openai_embeddings()
     embedded_vector = embedding_model.get_text_embedding(query)
     return embedded_vector
 
 
+def get_text_embeddings_batch(queries: list[str]) -> list[list[float]]:
+    embedding_model = get_openai_embeddings()
+    embedded_vectors = embedding_model.get_text_embedding_batch(
+        queries, show_progress=False
+    )
+    return embedded_vectors
+
+
 def upload_vectors_to_qdrant(
     dataframe: pd.DataFrame,
-    vector: list[float],
+    vector: list[str] | list[list[float]],
     collection_name: str = "movies_metadata",
 ) -> None:
     client = get_qdrant_client()  # TODO: Make it use dependancy injection
 
-    if not isinstance(embedded_vector, list[float]):
-        embedded_vector = get_text_embeddings(vector)
+    vector = list(vector)
+    if vector and isinstance(vector[0], str):
+        embedded_vector = get_text_embeddings_batch(vector)
+    else:
+        embedded_vector = vector
 
     try:
         print("Uploading points...")
-        client.upload_points(
+        client.upload_collection(
             collection_name=collection_name,
-            points=[
-                models.PointStruct(
-                    id=df["id"],
-                    vector=embedded_vector[idx],
-                )
-                for idx, df in dataframe.iterrows()
-            ],
+            ids=dataframe["id"].tolist(),
+            vectors=np.asarray(embedded_vector, dtype=np.float32),
+            batch_size=256,
+            parallel=4,
         )
         print("Uploading points was successful!")
     except Exception as e:
         print(f"Something went wrong: {e}")
 
 
+def enable_collection_quantization(collection_name: str = "movies_metadata") -> None:
+    client = get_qdrant_client()
+
+    try:
+        print("Enabling int8 scalar quantization...")
+        client.update_collection(
+            collection_name=collection_name,
+            quantization_config=models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    always_ram=True,
+                ),
+            ),
+        )
+        print("Quantization was enabled successfully!")
+    except Exception as e:
+        print(f"Something went wrong: {e}")
+
+
 def search_vectordb(
     query_vector: list[float],
     returned_vectors: int = 5,
@@ -83,6 +112,12 @@ def search_vectordb(
         collection_name=collection_name,
         query_vector=query_vector,
         limit=returned_vectors,
+        search_params=models.SearchParams(
+            quantization=models.QuantizationSearchParams(
+                rescore=True,
+                oversampling=2.0,
+            ),
+        ),
     )
     return response
 
@@ -2,10 +2,44 @@ import numpy as np
 import pandas as pd
 import polars as pl
 import ast
+import functools
+import json
 
 from Sameer.config import settings
 
 
+def _reject_json_constant(constant):
+    raise ValueError(f"{constant} is not a Python literal")
+
+
+def parse_list_literal(text):
+    """
+    Parses a stringified list (JSON or Python literal) into a list.
+
+    The TMDb columns are Python reprs. When the text holds no double quote, swapping the single quotes
+    for double quotes cannot change any value, so the C JSON parser handles that common case; anything
+    else (double quotes inside values, None, True, ...) goes through ast.literal_eval.
+
+    Parameters:
+    text (str): The stringified list.
+
+    Returns:
+    list: The parsed list, or an empty list if text is not a string or does not hold a list.
+    """
+    if not isinstance(text, str) or not text:
+        return []
+    if '"' in text:
+        parsed = ast.literal_eval(text)
+    else:
+        try:
+            parsed = json.loads(
+                text.replace("'", '"'), parse_constant=_reject_json_constant
+            )
+        except ValueError:
+            parsed = ast.literal_eval(text)
+    return parsed if isinstance(parsed, list) else []
+
+
 def extend_list_from_column(df, column_name, target_list, key="name"):
     """
     Extends a target list with values extracted from a specified column in a DataFrame.
@@ -23,28 +57,11 @@ def extend_list_from_column(df, column_name, target_list, key="name"):
     Returns:
     None
     """
-    temp_df = (
-        df[column_name]
-        .fillna("[]")
-        .apply(ast.literal_eval)
-        .apply(lambda x: [i[key] for i in x] if isinstance(x, list) else [])
+    target_list.extend(
+        item[key]
+        for text in df[column_name].fillna("[]")
+        for item in parse_list_literal(text)
     )
-    for i in temp_df:
-        if i:
-            target_list.extend(i)
-
-
-def get_director(crew):
-    """
-    Returns the name of the director from a list of dictionaries.
-
-    Parameters:
-    crew (list): A list of dictionaries containing information about crew members.
-
-    Returns:
-    str: The name of the director, or np.nan if no director is found.
-    """
-    return next((i["name"] for i in crew if i["job"] == "Director"), np.nan)
 
 
 def get_list(lst):
@@ -64,24 +81,74 @@ def get_list(lst):
     return []
 
 
-def clean_text_data(text_cols):
+def _parse_credits(text):
+    if not isinstance(text, str) or not text:
+        return []
+    parsed = ast.literal_eval(text)
+    return parsed if isinstance(parsed, list) else []
+
+
+def extract_director_and_cast(df, crew_column="crew", cast_column="cast"):
+    """
+    Extracts the director and the top 3 cast names while parsing the crew and cast columns.
+
+    Both columns are parsed and reduced in the same pass, so the parsed lists of dictionaries are never
+    stored as DataFrame columns. Credits almost always hold None values (e.g. profile_path), so they are
+    parsed with ast.literal_eval directly rather than trying JSON first.
+
+    Parameters:
+    df (pandas.DataFrame): The DataFrame containing the stringified crew and cast columns.
+    crew_column (str): The name of the crew column.
+    cast_column (str): The name of the cast column.
+
+    Returns:
+    pandas.DataFrame: A DataFrame with the same index as df and the director and cast columns.
+    """
+    rows = [
+        (
+            next(
+                (
+                    member["name"]
+                    for member in _parse_credits(crew)
+                    if member.get("job") == "Director"
+                ),
+                np.nan,
+            ),
+            [member["name"] for member in _parse_credits(cast)[:3]],
+        )
+        for crew, cast in zip(df[crew_column], df[cast_column])
+    ]
+    return pd.DataFrame(rows, columns=["director", "cast"], index=df.index)
+
+
+def clean_text_series(text_col):
     """
-    Cleans the input data by converting strings to lowercase and removing spaces.
+    Cleans a column of strings by converting them to lowercase and removing spaces.
 
     Parameters:
-    text_cols (str or list): The input data to be cleaned.
+    text_col (pandas.Series): The column to be cleaned.
 
     Returns:
-    str or list: The cleaned data.
+    pandas.Series: The cleaned column, with non-string values replaced by an empty string.
+    """
+    is_text = text_col.map(lambda value: isinstance(value, str)).astype(bool)
+    text_col = text_col.astype(object).where(is_text, "")
+    return text_col.str.replace(" ", "", regex=False).str.lower()
 
+
+def clean_text_list(text_list):
     """
-    if isinstance(text_cols, list):
-        return [str.lower(i.replace(" ", "")) for i in text_cols]
-    else:
-        if isinstance(text_cols, str):
-            return str.lower(text_cols.replace(" ", ""))
-        else:
-            return ""
+    Cleans a list of strings by converting them to lowercase and removing spaces.
+
+    Parameters:
+    text_list (list): The list to be cleaned.
+
+    Returns:
+    list: The cleaned list, or an empty list if text_list is not a list.
+    """
+    if isinstance(text_list, list):
+        return [text.replace(" ", "").lower() for text in text_list]
+    return []
 
 
 def create_bag_of_words(cols):
@@ -99,15 +166,30 @@ def create_bag_of_words(cols):
     )
 
 
+@functools.lru_cache(maxsize=None)
+def load_id_to_imdb_mapping(mapping_path: str) -> dict[int, str]:
+    """
+    Loads the movie id to imdb id mapping CSV once and keeps it in memory as a dict.
+
+    Parameters:
+    mapping_path (str): The path to the CSV file containing the id and imdb_id columns.
+
+    Returns:
+    dict[int, str]: A dictionary mapping movie IDs to their IMDb IDs (first occurrence wins).
+    """
+    ids = (
+        pl.read_csv(mapping_path, columns=["id", "imdb_id"])
+        .with_columns(pl.col("id").cast(pl.Int64, strict=False))
+        .drop_nulls("id")
+        .unique(subset="id", keep="first", maintain_order=True)
+    )
+    return dict(zip(ids["id"].to_list(), ids["imdb_id"].to_list()))
+
+
 def get_id_to_imdb_mapping(movie_id: int) -> str | None:
     try:
-        ids = pl.read_csv(settings.ID_MAPPING_DATASET_PATH)
-        imdb_id = ids.filter(pl.col("id") == movie_id)["imdb_id"]
-        final_imdb_id = imdb_id[0] if len(imdb_id) else None
-    except pl.exceptions.NoRowsReturnedError as enr:
-        print(f"Rows were not found, error: {enr}")
-        return None
+        ids = load_id_to_imdb_mapping(settings.ID_MAPPING_DATASET_PATH)
     except pl.exceptions.PolarsError as epe:
         print(f"An error with Polars occoured, error: {epe}")
         return None
-    return final_imdb_id
+    return ids.get(int(movie_id))
@@ -1,46 +1,52 @@
-import asyncio
-import pandas as pd
+import numpy as np
+
+from collections import Counter
+from heapq import nlargest
 
 from Sameer.services.ml_service import ml_utils
 
 from sklearn.feature_extraction.text import CountVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
 
 
 class MLRecommender:
     def __init__(self):
         self.model = ml_utils.load_pickle_model("notebooks/pickels/best_svd_model.pkl")
-        self.ratings_df = pd.read_csv("data/ratings_df.csv")
-        self.weighted_df = pd.read_csv("data/weighted_df.csv")
-        self.movies_df = pd.read_csv("data/movies_df.csv")
+        self.ratings_df = ml_utils.load_dataset("data/ratings_df.csv")
+        self.weighted_df = ml_utils.load_weighted_dataset("data/weighted_df.csv")
+        self.movies_df = ml_utils.load_dataset("data/movies_df.csv")
+        self.count_matrix = self.__get_count_matrix()
 
     def __get_user_rating_predictions(self, user_ratings):
-        predictions = []
-        for _, row in user_ratings.iterrows():
-            pred = self.model.predict(row["userId"], row["movieId"]).est
-            predictions.append((row["movieId"], pred))
-        return predictions
+        if user_ratings.empty:
+            return []
+        movie_ids = user_ratings["movieId"].to_numpy()
+        predictions = ml_utils.predict_svd_ratings(
+            user_ratings["userId"].iloc[0], movie_ids, self.model
+        )
+        return list(zip(movie_ids.tolist(), predictions.tolist()))
 
     def __get_top_collab_movies(self, predictions, number_of_movies):
         return [
-            x[0]
-            for x in sorted(predictions, key=lambda x: x[1], reverse=True)[
-                :number_of_movies
-            ]
+            movie_id
+            for movie_id, _ in nlargest(
+                number_of_movies, predictions, key=lambda x: x[1]
+            )
         ]
 
-    async def __get_similarity_matrix(self):
+    def __get_count_matrix(self):
+        """
+        Builds the L2-normalized bag of words count matrix of the movies.
+
+        With unit-length rows the cosine similarity of two movies is the dot product of their rows, so
+        the similarities of one movie are a single sparse product instead of a dense N x N matrix.
+
+        Returns:
+        scipy.sparse.csr_matrix: The normalized count matrix, one row per movie in movies_df.
+        """
         count = CountVectorizer(stop_words="english")
         count_matrix = count.fit_transform(self.movies_df["bag_of_words"])
-        sim_mat = await cosine_similarity(count_matrix, count_matrix)
-        return sim_mat
-
-    def __aget_similarity_matrix(self):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        sim_mat = loop.run_until_complete(self.__get_similarity_matrix())
-        loop.close()
-        return sim_mat
+        return normalize(count_matrix)
 
     def __get_similar_movies(self, last_watched_movieId, number_of_movies):
         """
@@ -54,16 +60,22 @@ class MLRecommender:
         list: A list of movie IDs of similar movies.
 
         """
-        sim_mat = self.__aget_similarity_matrix()
         if last_watched_movieId in self.movies_df["id"].values:
             watched_movie_idx = self.movies_df[
                 self.movies_df["id"] == last_watched_movieId
             ].index[0]
-            similar_movies = list(enumerate(sim_mat[watched_movie_idx]))
-            sorted_similar_movies = sorted(
-                similar_movies, key=lambda x: x[1], reverse=True
-            )[1 : number_of_movies + 1]
-            return [self.movies_df.iloc[i[0]]["id"] for i in sorted_similar_movies]
+            sim_row = (
+                (self.count_matrix @ self.count_matrix[watched_movie_idx].T)
+                .toarray()
+                .ravel()
+            )
+            sim_row[watched_movie_idx] = -np.inf
+            top_k = min(number_of_movies, len(sim_row) - 1)
+            if top_k <= 0:
+                return []
+            top_movies_idx = np.argpartition(-sim_row, top_k - 1)[:top_k]
+            top_movies_idx = top_movies_idx[np.argsort(-sim_row[top_movies_idx])]
+            return self.movies_df["id"].to_numpy()[top_movies_idx].tolist()
         else:
             print(f"Movie ID {last_watched_movieId} not found in movies_df.")
             return []
@@ -74,27 +86,13 @@ class MLRecommender:
 
         Parameters:
         - movie_ids (list): A list of movie IDs for which to fetch the weighted scores.
-        - weighted_df (pandas.DataFrame): The weighted DataFrame containing weighted scores.
 
         Returns:
         - weighted_scores (dict): A dictionary mapping movie IDs to their corresponding weighted scores.
         """
-        self.weighted_df = self.weighted_df.loc[
-            ~self.weighted_df.index.duplicated(keep="first")
-        ]
-
-        weighted_scores = {
-            movie_id: (
-                self.weighted_df.loc[movie_id]["score"]
-                if movie_id in self.weighted_df.index
-                else 0
-            )
-            for movie_id in movie_ids
-        }
-
-        return weighted_scores
+        return self.weighted_df["score"].reindex(movie_ids).fillna(0).to_dict()
 
-    def __combine_scores(collab_weighted_scores, content_weighted_scores):
+    def __combine_scores(self, collab_weighted_scores, content_weighted_scores):
         """
         Combines collaborative and content-based weighted scores for movies.
 
@@ -105,11 +103,11 @@ class MLRecommender:
         Returns:
         - combined_scores (dict): A dictionary containing movie IDs as keys and combined scores as values, where the combined score is calculated as the sum of 0.5 times the collaborative weighted score and 0.5 times the content-based weighted score.
         """
-        combined_scores = {}
-        for movie_id, score in collab_weighted_scores.items():
-            combined_scores[movie_id] = combined_scores.get(movie_id, 0) + 0.5 * score
-        for movie_id, score in content_weighted_scores.items():
-            combined_scores[movie_id] = combined_scores.get(movie_id, 0) + 0.5 * score
+        combined_scores = Counter()
+        for weighted_scores in (collab_weighted_scores, content_weighted_scores):
+            combined_scores.update(
+                {movie_id: 0.5 * score for movie_id, score in weighted_scores.items()}
+            )
         return combined_scores
 
     def hybrid_recommendation(self, user_id, number_of_movies=10):
@@ -132,19 +130,12 @@ class MLRecommender:
         top_content_movies = self.__get_similar_movies(
             last_watched_movieId, number_of_movies
         )
-        collab_weighted_scores = self.__get_weighted_scores(
-            top_collab_movies, self.weighted_df
-        )
-        content_weighted_scores = self.__get_weighted_scores(
-            top_content_movies, self.weighted_df
-        )
+        collab_weighted_scores = self.__get_weighted_scores(top_collab_movies)
+        content_weighted_scores = self.__get_weighted_scores(top_content_movies)
         combined_scores = self.__combine_scores(
             collab_weighted_scores, content_weighted_scores
         )
-        sorted_movies = sorted(
-            combined_scores.keys(), key=lambda x: combined_scores[x], reverse=True
-        )
-        return sorted_movies[:number_of_movies]
+        return nlargest(number_of_movies, combined_scores, key=combined_scores.get)
 
 
 if __name__ == "__main__":
@@ -1,19 +1,56 @@
+import mmap
+import os
 import pickle
+import tempfile
 import pandas as pd
+import polars as pl
 import numpy as np
 
+from functools import lru_cache
 from math import sqrt
 
-from sklearn.metrics import mean_squared_error
-from surprise import Reader, Dataset, AlgoBase
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from surprise import Reader, Dataset, AlgoBase, SVD, NMF
 
 
 def calculate_rmse(y_true: pd.Series, y_pred: pd.Series) -> float:
-    return sqrt(mean_squared_error(y_true, y_pred))
+    return sqrt(calculate_mse(y_true, y_pred))
 
 
 def calculate_mse(y_true: pd.Series, y_pred: pd.Series) -> float:
-    return mean_squared_error(y_true, y_pred)
+    diff = np.subtract(
+        np.asarray(y_true, dtype=np.float32), np.asarray(y_pred, dtype=np.float32)
+    )
+    if diff.size == 0:
+        return 0.0
+    return float(diff @ diff / diff.size)
+
+
+def _group_mean_lookup(
+    train_keys: pd.Series,
+    train_values: pd.Series,
+    test_keys: pd.Series,
+    fill_value: float,
+) -> np.ndarray:
+    """
+    Computes the mean of train_values per key in train_keys and gathers it for every key in test_keys.
+    Keys missing from the training set get fill_value.
+    """
+    codes, uniques = pd.factorize(train_keys, sort=False)
+    if len(uniques) == 0:
+        return np.full(len(test_keys), fill_value, dtype=np.float64)
+    values = train_values.to_numpy(dtype=np.float64)
+
+    valid = codes >= 0
+    codes, values = codes[valid], values[valid]
+
+    sums = np.bincount(codes, weights=values, minlength=len(uniques))
+    counts = np.bincount(codes, minlength=len(uniques))
+    means = sums / np.maximum(counts, 1)
+
+    test_codes = pd.Index(uniques).get_indexer(test_keys)
+    return np.where(test_codes >= 0, means[test_codes], fill_value)
 
 
 def calculate_user_item_mean_rating(
@@ -33,24 +70,20 @@ def calculate_user_item_mean_rating(
     """
 
     global_mean_rating = train_df["rating"].mean()
-    test_df["global_mean_rating"] = global_mean_rating
-
-    user_mean_ratings = train_df.groupby("userId")["rating"].mean().reset_index()
-    item_mean_ratings = train_df.groupby("movieId")["rating"].mean().reset_index()
 
-    test_df = pd.merge(test_df, user_mean_ratings, on="userId", how="left").rename(
-        columns={"rating_y": "user_mean_rating", "rating_x": "rating"}
+    user_mean_rating = _group_mean_lookup(
+        train_df["userId"], train_df["rating"], test_df["userId"], global_mean_rating
     )
-    test_df = pd.merge(test_df, item_mean_ratings, on="movieId", how="left").rename(
-        columns={"rating_y": "item_mean_rating", "rating_x": "rating"}
+    item_mean_rating = _group_mean_lookup(
+        train_df["movieId"], train_df["rating"], test_df["movieId"], global_mean_rating
     )
 
-    test_df["user_mean_rating"] = test_df["user_mean_rating"].fillna(global_mean_rating)
-    test_df["item_mean_rating"] = test_df["item_mean_rating"].fillna(global_mean_rating)
-
-    test_df["user_item_mean_rating"] = (
-        test_df["user_mean_rating"] + test_df["item_mean_rating"]
-    ) / 2
+    test_df = test_df.assign(
+        global_mean_rating=np.full(len(test_df), global_mean_rating),
+        user_mean_rating=user_mean_rating,
+        item_mean_rating=item_mean_rating,
+        user_item_mean_rating=(user_mean_rating + item_mean_rating) * 0.5,
+    ).reset_index(drop=True)
 
     return test_df
 
@@ -61,7 +94,7 @@ def calculate_weighted_mean_ratings(
     """
     Calculates the weighted mean ratings for a given DataFrame.
     This model employs a weighted average of the user mean and item mean ratings.
-    The weight ( w ) can be adjusted based on domain understanding.
+    The weight ( w ) is solved in closed form as the value in [0, 1] that minimizes the RMSE.
 
     The formula is :
     prediction = w * User Mean Rating + (1 - w) * Item Mean Rating, where 0 <= w <= 1
@@ -75,29 +108,31 @@ def calculate_weighted_mean_ratings(
     Returns:
         tuple[pd.DataFrame, float, float]: A tuple containing the following:
             - test_df (pd.DataFrame): The updated DataFrame with the calculated weighted mean ratings.
-            - best_w (float): The best weight value that resulted in the lowest RMSE.
+            - best_w (float): The weight value in [0, 1] that results in the lowest RMSE.
             - best_rmse (float): The lowest RMSE achieved.
 
     """
 
-    best_rmse = float("inf")
-    best_w = 0
+    # RMSE(w)^2 = mean((w * d + e0)^2) is a convex quadratic in w, so the best
+    # weight is its vertex -<d, e0> / <d, d>, clipped to [0, 1].
+    user_mean = test_df["user_mean_rating"].to_numpy(dtype=np.float64)
+    item_mean = test_df["item_mean_rating"].to_numpy(dtype=np.float64)
+    rating = test_df["rating"].to_numpy(dtype=np.float64)
 
-    for w in [i * 0.1 for i in range(11)]:
-        test_df["weighted_mean_rating_tmp"] = (
-            w * test_df["user_mean_rating"] + (1 - w) * test_df["item_mean_rating"]
-        )
-        rmse = calculate_rmse(test_df["rating"], test_df["weighted_mean_rating_tmp"])
+    d = user_mean - item_mean
+    e0 = item_mean - rating
 
-        if rmse < best_rmse:
-            best_rmse = rmse
-            best_w = w
+    d_dot_d = d @ d
+    best_w = 0.0 if d_dot_d == 0 else float(np.clip(-(d @ e0) / d_dot_d, 0.0, 1.0))
 
-    test_df["weighted_mean_rating"] = (
-        best_w * test_df["user_mean_rating"]
-        + (1 - best_w) * test_df["item_mean_rating"]
-    )
-    test_df = test_df.drop(columns=["weighted_mean_rating_tmp"])
+    # Reuse the d and e0 buffers for the predictions and residuals, so the
+    # whole fit allocates only two arrays.
+    weighted_mean_rating = np.multiply(d, best_w, out=d)
+    weighted_mean_rating += item_mean
+    residuals = np.subtract(weighted_mean_rating, rating, out=e0)
+    best_rmse = sqrt(residuals @ residuals / len(residuals)) if len(residuals) else 0.0
+
+    test_df = test_df.assign(weighted_mean_rating=weighted_mean_rating)
 
     return test_df, best_w, best_rmse
 
@@ -115,20 +150,26 @@ def load_data_into_surprise(
     Returns:
     tuple: A tuple containing the following:
         - trainset (surprise.Trainset): The training set in Surprise Dataset format.
-        - testset (list): The test set in Surprise Dataset format.
+        - testset (list): The test set as Surprise (user, item, rating) tuples.
     """
     train_data = Dataset.load_from_df(train_df, reader)
-    test_data = Dataset.load_from_df(test_df, reader)
-
     trainset = train_data.build_full_trainset()
-    testset = test_data.build_full_trainset().build_testset()
+
+    # Read the columns by position, like Dataset.load_from_df does for train_df.
+    testset = [
+        (userId, movieId, float(rating))
+        for userId, movieId, rating in test_df.itertuples(index=False, name=None)
+    ]
 
     return trainset, testset
 
 
+@lru_cache(maxsize=8)
 def load_pickle_model(model_path: str) -> object:
     """
     Loads a pickled model from the specified path.
+    The file is unpickled straight from a memory map, and the loaded model is cached per path, so
+    repeated calls return the same object without touching the disk again.
 
     Parameters:
     model_path (str): The path to the pickled model file.
@@ -137,13 +178,315 @@ def load_pickle_model(model_path: str) -> object:
     object: The loaded model object.
     """
     with open(model_path, "rb") as file:
-        model = pickle.load(file)
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            model = pickle.loads(mapped_file)
 
     return model
 
 
+def save_similarity_matrix(
+    matrix_similarity: np.ndarray, matrix_path: str, chunk_size: int = 1024
+) -> None:
+    """
+    Saves a similarity matrix as a row-major float16 .npy file, written in row chunks, at a quarter of
+    float64's size.
+
+    Parameters:
+    matrix_similarity (np.ndarray): The cosine similarity matrix.
+    matrix_path (str): The path of the .npy file to write.
+    chunk_size (int): The number of rows converted at once.
+    """
+    stored_matrix = np.lib.format.open_memmap(
+        matrix_path, mode="w+", dtype=np.float16, shape=matrix_similarity.shape
+    )
+    for start in range(0, len(matrix_similarity), chunk_size):
+        stored_matrix[start : start + chunk_size] = matrix_similarity[
+            start : start + chunk_size
+        ]
+    stored_matrix.flush()
+
+
+def load_similarity_matrix(matrix_path: str) -> np.ndarray:
+    """
+    Loads a similarity matrix saved by save_similarity_matrix as a read-only memory map.
+    Only the rows that are actually accessed are read from disk, and the pages are shared between
+    processes that load the same file.
+
+    Parameters:
+    matrix_path (str): The path to the .npy file.
+
+    Returns:
+    np.ndarray: The memory-mapped similarity matrix.
+    """
+    return np.load(matrix_path, mmap_mode="r")
+
+
+# The strings pd.read_csv reads as NaN by default, so the Parquet copy holds the same missing values
+# as the CSV it is made from.
+PANDAS_NA_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+
+def _get_parquet_path(csv_path: str) -> str:
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+
+def convert_dataset_to_parquet(csv_path: str) -> str:
+    """
+    Writes a Parquet copy of a CSV dataset next to it, for load_dataset to pick up.
+    Meant to be run offline after the CSV is (re)generated. The file is written to a temporary path
+    and moved into place, so readers never see a half-written copy.
+
+    Parameters:
+    csv_path (str): The path to the CSV file.
+
+    Returns:
+    str: The path of the written Parquet file.
+    """
+    parquet_path = _get_parquet_path(csv_path)
+    file_descriptor, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(parquet_path) or ".", suffix=".parquet.tmp"
+    )
+    os.close(file_descriptor)
+    try:
+        pl.read_csv(
+            csv_path, infer_schema_length=None, null_values=PANDAS_NA_VALUES
+        ).write_parquet(tmp_path)
+        os.replace(tmp_path, parquet_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return parquet_path
+
+
+def load_dataset(csv_path: str) -> pd.DataFrame:
+    """
+    Loads a CSV dataset, reading its Parquet copy instead when one is available.
+
+    The Parquet copy is written offline by convert_dataset_to_parquet. It is only used when it is at
+    least as new as the CSV; otherwise, or if it cannot be read, the CSV is parsed as before.
+    Nothing is written here.
+
+    Parameters:
+    csv_path (str): The path to the CSV file.
+
+    Returns:
+    pandas.DataFrame: The loaded dataset.
+    """
+    parquet_path = _get_parquet_path(csv_path)
+    try:
+        parquet_mtime = os.path.getmtime(parquet_path)
+        if not os.path.exists(csv_path) or parquet_mtime >= os.path.getmtime(csv_path):
+            dataset = pl.read_parquet(parquet_path)
+            return pd.DataFrame(
+                {name: dataset[name].to_numpy() for name in dataset.columns}
+            )
+    except (OSError, pl.exceptions.PolarsError):
+        pass
+    return pd.read_csv(csv_path)
+
+
+def load_weighted_dataset(csv_path: str) -> pd.DataFrame:
+    """
+    Loads the weighted scores dataset indexed by movie id, keeping the first row of any duplicated id.
+
+    Parameters:
+    csv_path (str): The path to the CSV file, written with the movie id in an "id" column.
+
+    Returns:
+    pandas.DataFrame: The weighted scores, one row per movie id.
+    """
+    weighted_df = load_dataset(csv_path).set_index("id")
+    return weighted_df.loc[~weighted_df.index.duplicated(keep="first")]
+
+
+def _to_inner_id(raw_id, to_inner) -> int:
+    try:
+        return to_inner(raw_id)
+    except ValueError:
+        return -1
+
+
+@lru_cache(maxsize=8)
+def _get_raw_to_inner_items(trainset) -> dict:
+    """
+    Builds the raw movie id -> inner id map of a trainset once, so looking up many movies does not
+    go through trainset.to_inner_iid and a raised ValueError for every unknown one.
+    """
+    return {
+        trainset.to_raw_iid(inner_id): inner_id for inner_id in trainset.all_items()
+    }
+
+
+def predict_svd_ratings(userId: int, movieIds, model: AlgoBase) -> np.ndarray:
+    """
+    Predicts the ratings of one user for many movies at once, straight from the SVD/NMF factor matrices.
+    Unknown users/items and clipping follow Surprise's own predict(); any other model (e.g. SVDpp,
+    whose estimate also has an implicit feedback term) falls back to calling predict() per movie.
+
+    Args:
+        userId (int): The ID of the user.
+        movieIds (array-like): The IDs of the movies to rate.
+        model (AlgoBase): The collaborative filtering model.
+
+    Returns:
+        np.ndarray: The estimated rating for every movie in movieIds.
+    """
+    if not isinstance(model, (SVD, NMF)):
+        return np.array([model.predict(userId, movieId).est for movieId in movieIds])
+
+    trainset = model.trainset
+    user_inner = _to_inner_id(userId, trainset.to_inner_uid)
+    raw_to_inner_items = _get_raw_to_inner_items(trainset)
+    item_inner = np.fromiter(
+        (raw_to_inner_items.get(movieId, -1) for movieId in movieIds),
+        dtype=np.int64,
+        count=len(movieIds),
+    )
+    known_items = item_inner >= 0
+    safe_items = np.where(known_items, item_inner, 0)
+
+    estimates = np.full(len(item_inner), trainset.global_mean, dtype=np.float64)
+    if model.biased:
+        estimates += np.where(known_items, model.bi[safe_items], 0)
+        if user_inner >= 0:
+            estimates += model.bu[user_inner]
+            estimates += np.where(
+                known_items, model.qi[safe_items] @ model.pu[user_inner], 0
+            )
+    elif user_inner >= 0:
+        estimates = np.where(
+            known_items, model.qi[safe_items] @ model.pu[user_inner], estimates
+        )
+
+    lower_bound, higher_bound = trainset.rating_scale
+    return np.clip(estimates, lower_bound, higher_bound)
+
+
+def build_similarity_matrix(features, chunk_size: int = 1024) -> np.ndarray:
+    """
+    Builds the cosine similarity matrix between the rows of a feature matrix as float32.
+
+    The rows are L2-normalized once, so every chunk of rows is a single float32 matrix product against
+    the whole feature matrix, and only one chunk of intermediate results is alive at a time.
+
+    Args:
+        features (np.ndarray or scipy.sparse matrix): The content features, one row per movie
+            (e.g. the CountVectorizer bag of words matrix).
+        chunk_size (int): The number of rows computed at once.
+
+    Returns:
+        np.ndarray: The (number of movies, number of movies) float32 similarity matrix.
+    """
+    features = normalize(features).astype(np.float32)
+    number_of_rows = features.shape[0]
+    matrix_similarity = np.empty((number_of_rows, number_of_rows), dtype=np.float32)
+    for start in range(0, number_of_rows, chunk_size):
+        block = features[start : start + chunk_size] @ features.T
+        matrix_similarity[start : start + chunk_size] = (
+            block.toarray() if sparse.issparse(block) else block
+        )
+    return matrix_similarity
+
+
+def quantize_similarity_matrix(
+    matrix_similarity: np.ndarray, chunk_size: int = 1024
+) -> np.ndarray:
+    """
+    Quantizes a cosine similarity matrix from [-1, 1] to int8 in [-127, 127], so
+    get_content_based_rating and get_content_neighbors scan a quarter of the bytes of float32.
+
+    Args:
+        matrix_similarity (np.ndarray): The cosine similarity matrix.
+        chunk_size (int): The number of rows converted at once.
+
+    Returns:
+        np.ndarray: The int8 similarity matrix.
+    """
+    matrix_similarity_i8 = np.empty(matrix_similarity.shape, dtype=np.int8)
+    for start in range(0, len(matrix_similarity), chunk_size):
+        rows = np.asarray(matrix_similarity[start : start + chunk_size])
+        matrix_similarity_i8[start : start + chunk_size] = np.clip(
+            np.round(rows * 127.0), -127, 127
+        )
+    return matrix_similarity_i8
+
+
+def _top_similar_indices(
+    sim_rows: np.ndarray, row_indices: np.ndarray, number_of_movies: int
+) -> np.ndarray:
+    """
+    Returns, for every row, the column indices of the number_of_movies highest similarities sorted in
+    descending order, leaving out the movie itself (given by row_indices).
+
+    Neighbors are picked by rank only, so float16 or int8 similarity rows lose next to nothing.
+    The movie itself is excluded explicitly rather than by dropping the top hit, since a quantized
+    matrix can tie it with its closest neighbors.
+    """
+    scores = -sim_rows
+    worst_score = (
+        np.inf
+        if np.issubdtype(scores.dtype, np.floating)
+        else np.iinfo(scores.dtype).max
+    )
+    scores[np.arange(len(row_indices)), row_indices] = worst_score
+
+    top_k = min(number_of_movies, scores.shape[1] - 1)
+    top_indices = np.argpartition(scores, top_k - 1, axis=1)[:, :top_k]
+    order = np.argsort(np.take_along_axis(scores, top_indices, axis=1), axis=1)
+    return np.take_along_axis(top_indices, order, axis=1)
+
+
+def get_content_neighbors(
+    matrix_similarity: np.ndarray, number_of_neighbors: int = 10, chunk_size: int = 1024
+) -> np.ndarray:
+    """
+    Precomputes the most similar movies of every movie, so content-based ratings do not have to rank
+    a similarity row on every call.
+
+    Args:
+        matrix_similarity (np.ndarray): The cosine similarity matrix, e.g. F @ F.T for L2-normalized
+            content features F.
+        number_of_neighbors (int): The number of neighbors to keep per movie.
+        chunk_size (int): The number of rows ranked at once, bounding the temporary memory used.
+
+    Returns:
+        np.ndarray: An int32 array of shape (number of movies, number_of_neighbors) holding the positional
+        indices of each movie's neighbors, most similar first.
+    """
+    return np.concatenate(
+        [
+            _top_similar_indices(
+                np.asarray(matrix_similarity[start : start + chunk_size]),
+                np.arange(start, min(start + chunk_size, len(matrix_similarity))),
+                number_of_neighbors,
+            ).astype(np.int32)
+            for start in range(0, len(matrix_similarity), chunk_size)
+        ]
+    )
+
+
 def get_collaborative_rating(userId: int, movieId: int, model: AlgoBase):
-    return model.predict(userId, movieId).est
+    return float(predict_svd_ratings(userId, [movieId], model)[0])
 
 
 def get_content_based_rating(
@@ -152,6 +495,7 @@ def get_content_based_rating(
     matrix_similarity: np.ndarray,
     movies_df: pd.DataFrame,
     model: AlgoBase,
+    neighbors: np.ndarray | None = None,
 ):
     """
     Calculate the content-based rating for a given user and movie.
@@ -162,19 +506,44 @@ def get_content_based_rating(
         matrix_similarity (np.ndarray): The cosine similarity matrix.
         movies_df (pd.DataFrame): The DataFrame containing movie information.
         model (AlgoBase): The collaborative filtering model.
+        neighbors (np.ndarray, optional): The table from get_content_neighbors. When given, the 10 most
+            similar movies are read from it instead of ranking the similarity row.
 
     Returns:
         float: The content-based rating for the user and movie.
     """
-    sim_scores = sorted(
-        list(enumerate(matrix_similarity[movieId])), key=lambda x: x[1], reverse=True
-    )[1:11]
-    movie_indices = [i[0] for i in sim_scores]
-    similar_movies = movies_df.iloc[movie_indices]
-    similar_movies["est"] = similar_movies["id"].apply(
-        lambda x: model.predict(userId, x).est
+    if neighbors is not None:
+        movie_indices = neighbors[movieId]
+    else:
+        sim_row = np.asarray(matrix_similarity[movieId])
+        movie_indices = _top_similar_indices(sim_row[np.newaxis, :], [movieId], 10)[0]
+    similar_movie_ids = movies_df["id"].to_numpy()[movie_indices]
+    return float(predict_svd_ratings(userId, similar_movie_ids, model).mean())
+
+
+def get_weighted_score_map(
+    movies_df: pd.DataFrame,
+    weighted_df: pd.DataFrame,
+    default_score: float = 0,
+) -> dict:
+    """
+    Precomputes the weighted score of every movie, keyed like get_weighted_score's movieId.
+
+    Parameters:
+    - movies_df (pd.DataFrame): The DataFrame containing movie information.
+    - weighted_df (pd.DataFrame): The DataFrame containing weighted scores, indexed by movie id.
+    - default_score (float): The score used for movies missing from weighted_df.
+
+    Returns:
+    - dict: A dictionary mapping each movies_df index to its weighted score.
+    """
+    scores = weighted_df.loc[~weighted_df.index.duplicated(keep="first"), "score"]
+    return dict(
+        zip(
+            movies_df.index,
+            scores.reindex(movies_df["id"]).fillna(default_score).tolist(),
+        )
     )
-    return similar_movies["est"].mean()
 
 
 def get_weighted_score(
@@ -182,6 +551,7 @@ def get_weighted_score(
     movies_df: pd.DataFrame,
     weighted_df: pd.DataFrame,
     default_score: float = 0,
+    score_map: dict | None = None,
 ):
     """
     Calculate the weighted score for a given movie.
@@ -191,10 +561,14 @@ def get_weighted_score(
     - movies_df (pd.DataFrame): The DataFrame containing movie information.
     - weighted_df (pd.DataFrame): The DataFrame containing weighted scores.
     - default_score (float): The default score to return if the movie ID is not found.
+    - score_map (dict, optional): The dictionary from get_weighted_score_map. When given, the score is a
+      single dictionary lookup instead of two DataFrame .loc lookups.
 
     Returns:
     - float: The weighted score of the movie, or the default score if the movie ID is not found.
     """
+    if score_map is not None:
+        return score_map.get(movieId, default_score)
     return (
         weighted_df.loc[movies_df.loc[movieId, "id"], "score"]
         if movieId in movies_df.index
@@ -210,6 +584,8 @@ def hybrid_predicted_rating(
     similarity_matrix: np.ndarray,
     movies_df: pd.DataFrame,
     weighted_df: pd.DataFrame,
+    neighbors: np.ndarray | None = None,
+    score_map: dict | None = None,
 ):
     """
     Calculates the hybrid predicted rating for a given user and movie using a combination of collaborative filtering,
@@ -222,17 +598,88 @@ def hybrid_predicted_rating(
         similarity_matrix (np.ndarray): The cosine similarity matrix for content-based filtering.
         movies_df (pd.DataFrame): The DataFrame containing movie information.
         weighted_df (pd.DataFrame): The DataFrame containing weighted scores for movies.
+        neighbors (np.ndarray, optional): The precomputed table from get_content_neighbors.
+        score_map (dict, optional): The precomputed dictionary from get_weighted_score_map.
 
     Returns:
         float: The hybrid predicted rating for the given user and movie.
     """
     collaborative_rating = get_collaborative_rating(userId, movieId, model)
     content_rating = get_content_based_rating(
-        userId, movieId, similarity_matrix, movies_df, model
+        userId, movieId, similarity_matrix, movies_df, model, neighbors
+    )
+    weighted_score = get_weighted_score(
+        movieId, movies_df, weighted_df, score_map=score_map
     )
-    weighted_score = get_weighted_score(movieId, movies_df, weighted_df)
 
     final_rating = (
         (0.5 * collaborative_rating) + (0.2 * content_rating) + (0.3 * weighted_score)
     )
     return final_rating
+
+
+def hybrid_predicted_rating_batch(
+    userId: int,
+    movieIds,
+    model: AlgoBase,
+    similarity_matrix: np.ndarray,
+    movies_df: pd.DataFrame,
+    weighted_df: pd.DataFrame,
+    neighbors: np.ndarray | None = None,
+    score_map: dict | None = None,
+) -> np.ndarray:
+    """
+    Calculates the hybrid predicted ratings of one user for many movies at once.
+    Gives the same result as calling hybrid_predicted_rating for every movie, but the collaborative and
+    content-based parts are each computed with a single batched SVD prediction.
+
+    Args:
+        userId (int): The ID of the user.
+        movieIds (array-like): The IDs of the movies. A ValueError is raised for non-integer IDs.
+        model (AlgoBase): The collaborative filtering model.
+        similarity_matrix (np.ndarray): The cosine similarity matrix for content-based filtering.
+        movies_df (pd.DataFrame): The DataFrame containing movie information.
+        weighted_df (pd.DataFrame): The DataFrame containing weighted scores for movies.
+        neighbors (np.ndarray, optional): The precomputed table from get_content_neighbors.
+        score_map (dict, optional): The precomputed dictionary from get_weighted_score_map.
+
+    Returns:
+        np.ndarray: The hybrid predicted rating for every movie in movieIds.
+    """
+    movieIds = np.asarray(movieIds)
+    if movieIds.size and not np.issubdtype(movieIds.dtype, np.integer):
+        # Casting would silently truncate e.g. 12.7 to 12 and rate the wrong movie.
+        if not np.issubdtype(movieIds.dtype, np.floating) or not np.array_equal(
+            movieIds, np.round(movieIds)
+        ):
+            raise ValueError("movieIds must hold whole-number movie indices")
+    movieIds = movieIds.astype(np.intp)
+
+    collaborative_ratings = predict_svd_ratings(userId, movieIds, model)
+
+    if neighbors is not None:
+        neighbor_indices = neighbors[movieIds]
+    else:
+        neighbor_indices = _top_similar_indices(
+            np.asarray(similarity_matrix[movieIds]), movieIds, 10
+        )
+    neighbor_ids = movies_df["id"].to_numpy()[neighbor_indices]
+    content_ratings = (
+        predict_svd_ratings(userId, neighbor_ids.ravel(), model)
+        .reshape(neighbor_ids.shape)
+        .mean(axis=1)
+    )
+
+    if score_map is None:
+        score_map = get_weighted_score_map(movies_df, weighted_df)
+    weighted_scores = np.fromiter(
+        (score_map.get(movieId, 0) for movieId in movieIds.tolist()),
+        dtype=np.float64,
+        count=len(movieIds),
+    )
+
+    return (
+        (0.5 * collaborative_ratings)
+        + (0.2 * content_ratings)
+        + (0.3 * weighted_scores)
+    )
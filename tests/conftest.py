@@ -0,0 +1,6 @@
+import os
+
+# Settings are read from the environment at import time; the ML utilities under
+# test never call these services, so placeholders are enough without a .env.
+for name in ["OMDP_API_KEY", "OPENAI_API_KEY", "QDRANT_API_KEY", "QDRANT_URL"]:
+    os.environ.setdefault(name, "test")
@@ -0,0 +1,124 @@
+import ast
+
+import pandas as pd
+import pytest
+
+from Sameer.services.ml_service import DataPreperation
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[]",
+        "[{'id': 18, 'name': 'Drama'}, {'id': 80, 'name': 'Crime'}]",
+        "['a\", \"b']",
+        "[{'name': 'He said \"hi\"'}]",
+        '[{"name": "Ocean\'s Eleven"}]',
+        "[{'name': \"Ocean's Eleven\"}]",
+        "[{'name': 'x', 'profile_path': None, 'adult': True}]",
+        "[{'name': 'caf\\u00e9', 'path': 'a\\\\b'}]",
+        "[1, 2.5, -3]",
+    ],
+)
+def test_parse_list_literal_matches_literal_eval(text):
+    assert DataPreperation.parse_list_literal(text) == ast.literal_eval(text)
+
+
+@pytest.mark.parametrize("text", [None, float("nan"), "", "None", "True", "{'a': 1}"])
+def test_parse_list_literal_without_list(text):
+    assert DataPreperation.parse_list_literal(text) == []
+
+
+@pytest.mark.parametrize("text", ["[1, 2", "['a', NaN]", "[Infinity]", "not a list"])
+def test_parse_list_literal_rejects_malformed_input(text):
+    with pytest.raises((ValueError, SyntaxError)):
+        DataPreperation.parse_list_literal(text)
+
+
+def test_extend_list_from_column():
+    df = pd.DataFrame(
+        {
+            "genres": [
+                "[{'id': 1, 'name': 'Drama'}, {'id': 2, 'name': 'Crime'}]",
+                None,
+                "[]",
+                "[{'id': 3, 'name': 'Rock \"n\" Roll'}, {'id': 4, 'name': \"Children's\"}]",
+                "[{'id': 5, 'name': 'Family', 'logo_path': None}]",
+            ]
+        }
+    )
+    target_list = ["Comedy"]
+
+    DataPreperation.extend_list_from_column(df, "genres", target_list)
+
+    assert target_list == [
+        "Comedy",
+        "Drama",
+        "Crime",
+        'Rock "n" Roll',
+        "Children's",
+        "Family",
+    ]
+
+    ids = []
+    DataPreperation.extend_list_from_column(df, "genres", ids, key="id")
+    assert ids == [1, 2, 3, 4, 5]
+
+
+def test_extend_list_from_column_rejects_malformed_input():
+    df = pd.DataFrame({"genres": ["[{'name': 'Drama'}", "[]"]})
+
+    with pytest.raises((ValueError, SyntaxError)):
+        DataPreperation.extend_list_from_column(df, "genres", [])
+
+
+def test_extract_director_and_cast():
+    df = pd.DataFrame(
+        {
+            "crew": [
+                "[{'job': 'Producer', 'name': 'A', 'profile_path': None},"
+                " {'job': 'Director', 'name': 'B', 'profile_path': '/b.jpg'}]",
+                "[{'job': 'Writer', 'name': 'C', 'profile_path': None}]",
+                None,
+            ],
+            "cast": [
+                "[{'name': 'D', 'profile_path': None}, {'name': \"O'E\"},"
+                " {'name': 'F'}, {'name': 'G'}]",
+                "[]",
+                None,
+            ],
+        },
+        index=[10, 20, 30],
+    )
+
+    credits_df = DataPreperation.extract_director_and_cast(df)
+
+    assert credits_df.index.tolist() == [10, 20, 30]
+    assert credits_df["director"].tolist()[0] == "B"
+    assert credits_df["director"].iloc[1:].isna().all()
+    assert credits_df["cast"].tolist() == [["D", "O'E", "F"], [], []]
+
+
+@pytest.mark.parametrize(
+    "text_col, expected",
+    [
+        (
+            pd.Series(["Christopher Nolan", None, "ridley Scott"]),
+            ["christophernolan", "", "ridleyscott"],
+        ),
+        (pd.Series(["Drama", 12, float("nan")]), ["drama", "", ""]),
+        (pd.Series([True, False]), ["", ""]),
+        (pd.Series([float("nan"), float("nan")]), ["", ""]),
+        (pd.Series([], dtype=object), []),
+    ],
+)
+def test_clean_text_series(text_col, expected):
+    assert DataPreperation.clean_text_series(text_col).tolist() == expected
+
+
+def test_clean_text_list():
+    assert DataPreperation.clean_text_list(["Tom Hanks", "O'Neil"]) == [
+        "tomhanks",
+        "o'neil",
+    ]
+    assert DataPreperation.clean_text_list(float("nan")) == []
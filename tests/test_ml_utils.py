@@ -0,0 +1,271 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from surprise import SVD, SVDpp, NMF, Dataset, Reader
+
+from Sameer.services.ml_service import ml_utils
+
+
+@pytest.fixture(scope="module")
+def trainset():
+    rng = np.random.default_rng(0)
+    ratings_df = pd.DataFrame(
+        {
+            "userId": rng.integers(1, 30, 500),
+            "movieId": rng.integers(1, 60, 500),
+            "rating": rng.integers(1, 11, 500) / 2,
+        }
+    ).drop_duplicates(["userId", "movieId"])
+    reader = Reader(rating_scale=(0.5, 5))
+    return Dataset.load_from_df(ratings_df, reader).build_full_trainset()
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        SVD(n_factors=8, random_state=0),
+        SVD(n_factors=8, biased=False, random_state=0),
+        NMF(n_factors=8, random_state=0),
+        NMF(n_factors=8, biased=True, random_state=0),
+        SVDpp(n_factors=8, n_epochs=5, random_state=0),
+    ],
+)
+@pytest.mark.parametrize("userId", [1, 7, 10_000])
+def test_predict_svd_ratings_matches_predict(trainset, model, userId):
+    model.fit(trainset)
+    # Includes movies that are not in the trainset.
+    movieIds = list(range(0, 70))
+
+    expected = [model.predict(userId, movieId).est for movieId in movieIds]
+
+    np.testing.assert_allclose(
+        ml_utils.predict_svd_ratings(userId, movieIds, model), expected
+    )
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32, np.float16, np.int8])
+@pytest.mark.parametrize("number_of_movies", [1, 5, 19, 50])
+def test_top_similar_indices_matches_full_sort(dtype, number_of_movies):
+    rng = np.random.default_rng(1)
+    features = rng.random((20, 6))
+    features /= np.linalg.norm(features, axis=1, keepdims=True)
+    matrix_similarity = features @ features.T
+    if dtype == np.int8:
+        matrix_similarity = ml_utils.quantize_similarity_matrix(matrix_similarity)
+    else:
+        matrix_similarity = matrix_similarity.astype(dtype)
+
+    row_indices = np.arange(3, 11)
+    sim_rows = matrix_similarity[row_indices]
+
+    top_indices = ml_utils._top_similar_indices(
+        sim_rows.copy(), row_indices, number_of_movies
+    )
+
+    top_k = min(number_of_movies, matrix_similarity.shape[1] - 1)
+    assert top_indices.shape == (len(row_indices), top_k)
+    for row, movie, indices in zip(sim_rows, row_indices, top_indices):
+        assert movie not in indices
+        # Ties may come back in any order, so compare the similarities.
+        expected = np.sort(np.delete(row, movie))[::-1][:top_k]
+        np.testing.assert_array_equal(row[indices], expected)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_weighted_mean_ratings_matches_grid_search(seed):
+    rng = np.random.default_rng(seed)
+    size = 200
+    rating = rng.integers(1, 11, size) / 2
+    test_df = pd.DataFrame(
+        {
+            "user_mean_rating": rating + rng.normal(seed - 2, 1, size),
+            "item_mean_rating": rating + rng.normal(2 - seed, 1, size),
+            "rating": rating,
+        }
+    )
+
+    _, best_w, best_rmse = ml_utils.calculate_weighted_mean_ratings(test_df)
+
+    grid = np.linspace(0, 1, 10_001)
+    predictions = np.outer(grid, test_df["user_mean_rating"]) + np.outer(
+        1 - grid, test_df["item_mean_rating"]
+    )
+    grid_rmse = np.sqrt(((predictions - rating) ** 2).mean(axis=1))
+
+    assert best_w == pytest.approx(grid[grid_rmse.argmin()], abs=1e-4)
+    # The closed form is exact, so it can only beat the grid's resolution.
+    assert best_rmse <= grid_rmse.min() + 1e-12
+    assert best_rmse == pytest.approx(grid_rmse.min(), rel=1e-6)
+
+
+@pytest.fixture(scope="module")
+def hybrid_inputs(trainset):
+    model = SVD(n_factors=8, random_state=0).fit(trainset)
+    rng = np.random.default_rng(2)
+    # Movie ids 1..60 match the trainset, a few more are unknown to the model.
+    movies_df = pd.DataFrame({"id": np.arange(1, 71)})
+    weighted_df = pd.DataFrame(
+        {"score": rng.random(50) * 5}, index=rng.permutation(np.arange(1, 81))[:50]
+    )
+    features = rng.random((len(movies_df), 6))
+    features /= np.linalg.norm(features, axis=1, keepdims=True)
+    similarity_matrix = features @ features.T
+    return model, similarity_matrix, movies_df, weighted_df
+
+
+@pytest.mark.parametrize("use_precomputed", [False, True])
+@pytest.mark.parametrize("movieIds", [[], [0], [5, 3, 5, 69], list(range(70))])
+def test_hybrid_predicted_rating_batch_matches_single(
+    hybrid_inputs, movieIds, use_precomputed
+):
+    model, similarity_matrix, movies_df, weighted_df = hybrid_inputs
+    precomputed = {}
+    if use_precomputed:
+        precomputed = {
+            "neighbors": ml_utils.get_content_neighbors(similarity_matrix),
+            "score_map": ml_utils.get_weighted_score_map(movies_df, weighted_df),
+        }
+    userId = 7
+
+    expected = [
+        ml_utils.hybrid_predicted_rating(
+            userId, movieId, model, similarity_matrix, movies_df, weighted_df
+        )
+        for movieId in movieIds
+    ]
+    ratings = ml_utils.hybrid_predicted_rating_batch(
+        userId,
+        movieIds,
+        model,
+        similarity_matrix,
+        movies_df,
+        weighted_df,
+        **precomputed,
+    )
+
+    assert ratings.shape == (len(movieIds),)
+    np.testing.assert_allclose(ratings, expected)
+
+
+@pytest.mark.parametrize(
+    "train_keys", [pd.Series([], dtype=np.float64), pd.Series([np.nan, np.nan])]
+)
+def test_group_mean_lookup_without_train_keys(train_keys):
+    train_values = pd.Series(np.ones(len(train_keys)))
+    test_keys = pd.Series([1, 2, np.nan])
+
+    np.testing.assert_array_equal(
+        ml_utils._group_mean_lookup(train_keys, train_values, test_keys, 3.5),
+        [3.5, 3.5, 3.5],
+    )
+
+
+def test_group_mean_lookup():
+    train_keys = pd.Series([1, 2, 1, np.nan, 3])
+    train_values = pd.Series([4.0, 2.0, 2.0, 5.0, 1.0])
+    test_keys = pd.Series([3, 1, 4, 2])
+
+    np.testing.assert_array_equal(
+        ml_utils._group_mean_lookup(train_keys, train_values, test_keys, 0.0),
+        [1.0, 3.0, 0.0, 2.0],
+    )
+
+
+def test_load_data_into_surprise_reads_columns_by_position():
+    reader = Reader(rating_scale=(0.5, 5))
+    train_df = pd.DataFrame({"u": [1, 2], "m": [10, 20], "r": [4, 3]})
+    test_df = pd.DataFrame({"u": [2, 3], "m": [10, 30], "r": [5, 1]})
+
+    trainset, testset = ml_utils.load_data_into_surprise(train_df, test_df, reader)
+
+    assert trainset.n_ratings == 2
+    assert testset == [(2, 10, 5.0), (3, 30, 1.0)]
+    assert all(isinstance(rating, float) for _, _, rating in testset)
+
+
+def test_load_dataset_matches_with_and_without_parquet(tmp_path):
+    csv_path = tmp_path / "movies_df.csv"
+    csv_path.write_text(
+        "id,title,score,vote_count,adult\n"
+        "1,NA,1.5,3,True\n"
+        "2,N/A,,4,False\n"
+        '3,"null",2.5,,True\n'
+        "4,Heat,nan,6,False\n"
+        "5,,3.5,7,True\n"
+        "6,None,#N/A,8,False\n"
+    )
+
+    from_csv = ml_utils.load_dataset(str(csv_path))
+    parquet_path = ml_utils.convert_dataset_to_parquet(str(csv_path))
+    from_parquet = ml_utils.load_dataset(str(csv_path))
+
+    assert parquet_path == str(tmp_path / "movies_df.parquet")
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "movies_df.csv",
+        "movies_df.parquet",
+    ]
+    assert from_csv["title"].isna().sum() == 5
+    pd.testing.assert_frame_equal(from_parquet, from_csv)
+
+
+def test_load_weighted_dataset_dedupes_movie_ids(tmp_path):
+    csv_path = tmp_path / "weighted_df.csv"
+    weighted_df = pd.DataFrame(
+        {"popularity": [0.1, 0.2, 0.3, 0.4], "score": [1.0, 2.0, 3.0, 4.0]},
+        index=pd.Index([862, 8844, 862, 15602], name="id"),
+    )
+    weighted_df.to_csv(csv_path, index_label="id")
+
+    loaded = ml_utils.load_weighted_dataset(str(csv_path))
+
+    assert loaded.index.tolist() == [862, 8844, 15602]
+    assert loaded["score"].reindex([15602, 862, 1]).fillna(0).tolist() == [
+        4.0,
+        1.0,
+        0.0,
+    ]
+
+
+def test_calculate_user_item_mean_rating():
+    train_df = pd.DataFrame(
+        {"userId": [1, 1, 2], "movieId": [10, 20, 10], "rating": [4.0, 2.0, 3.0]}
+    )
+    test_df = pd.DataFrame(
+        {"userId": [2, 3, 1], "movieId": [20, 10, 30], "rating": [5.0, 1.0, 3.0]},
+        index=[7, 3, 5],
+    )
+
+    result = ml_utils.calculate_user_item_mean_rating(train_df, test_df)
+
+    assert result.index.equals(pd.RangeIndex(3))
+    assert result["global_mean_rating"].tolist() == [3.0, 3.0, 3.0]
+    assert result["user_mean_rating"].tolist() == [3.0, 3.0, 3.0]
+    assert result["item_mean_rating"].tolist() == [2.0, 3.5, 3.0]
+    assert result["user_item_mean_rating"].tolist() == [2.5, 3.25, 3.0]
+    # test_df is left untouched.
+    assert test_df.columns.tolist() == ["userId", "movieId", "rating"]
+    assert test_df.index.tolist() == [7, 3, 5]
+
+
+def test_hybrid_predicted_rating_batch_accepts_integral_floats(hybrid_inputs):
+    model, similarity_matrix, movies_df, weighted_df = hybrid_inputs
+
+    np.testing.assert_allclose(
+        ml_utils.hybrid_predicted_rating_batch(
+            7, [12.0, 3.0], model, similarity_matrix, movies_df, weighted_df
+        ),
+        ml_utils.hybrid_predicted_rating_batch(
+            7, [12, 3], model, similarity_matrix, movies_df, weighted_df
+        ),
+    )
+
+
+@pytest.mark.parametrize("movieIds", [[12.7, 3.0], [np.nan], ["12"]])
+def test_hybrid_predicted_rating_batch_rejects_non_integer_ids(hybrid_inputs, movieIds):
+    model, similarity_matrix, movies_df, weighted_df = hybrid_inputs
+
+    with pytest.raises(ValueError):
+        ml_utils.hybrid_predicted_rating_batch(
+            7, movieIds, model, similarity_matrix, movies_df, weighted_df
+        )